@@ -4,6 +4,8 @@ from datetime import datetime, timedelta
 import gspread
 from google.oauth2.service_account import Credentials
 import json
+import os
+from change_feed import empty_snapshot, sync_change_feed, find_date_row_index, build_row_keys, get_key_columns, get_changed_columns
 
 # ========================
 # 페이지 설정
@@ -39,7 +41,6 @@ def get_google_client():
             pass
         
         # 방법 2: credentials.json 파일 사용 (로컬 테스트용)
-        import os
         if os.path.exists('credentials.json'):
             credentials = Credentials.from_service_account_file(
                 'credentials.json',
@@ -63,7 +64,10 @@ def get_google_client():
 
 @st.cache_data(ttl=600)  # 10분마다 갱신
 def load_sheet_data(_client, sheet_id):
-    """Google Sheets에서 4개 탭 데이터 로드"""
+    """Google Sheets에서 4개 탭 데이터 로드 + 진도 변경 피드 동기화
+
+    캐시가 만료돼 실제로 다시 불러올 때만 이전 스냅샷과 비교함
+    """
     try:
         spreadsheet = _client.open_by_key(sheet_id)
         
@@ -73,10 +77,17 @@ def load_sheet_data(_client, sheet_id):
         그룹진도표 = pd.DataFrame(spreadsheet.worksheet("그룹진도표").get_all_records())
         개별진도표 = pd.DataFrame(spreadsheet.worksheet("개별진도표").get_all_records())
         
-        return 학생명단, 반정보, 그룹진도표, 개별진도표
+        # 이전 동기화와 비교해 변경 내역 기록 (실패해도 데이터는 그대로 표시)
+        try:
+            snapshot = sync_change_feed(sheet_id, {"그룹진도표": 그룹진도표, "개별진도표": 개별진도표})
+        except Exception as e:
+            st.warning(f"변경 내역 비교 실패: {str(e)}")
+            snapshot = empty_snapshot()
+        
+        return 학생명단, 반정보, 그룹진도표, 개별진도표, snapshot
     except Exception as e:
         st.error(f"데이터 로드 실패: {str(e)}")
-        return None, None, None, None
+        return None, None, None, None, None
 
 # ========================
 # 시간표 템플릿
@@ -177,21 +188,11 @@ def load_sheet_data(_client, sheet_id):
 def get_class_progress(date_str, class_name, 그룹진도표, 반정보):
     """특정 날짜, 특정 반의 그룹 진도 가져오기 (진도 + 과제)"""
     try:
-        # 날짜 형식 통일 (25-11-10 형식)
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-        formatted_date = date_obj.strftime("%y-%m-%d")  # 25-11-10
-        
-        # 그룹진도표에서 해당 날짜 행 찾기 (다양한 형식 지원)
-        date_row = None
-        for idx, row in 그룹진도표.iterrows():
-            date_col = str(row['날짜']).strip()
-            # "25-11-10 월" 형식도 지원
-            if formatted_date in date_col or date_col.startswith(formatted_date):
-                date_row = 그룹진도표.iloc[[idx]]
-                break
-        
-        if date_row is None or date_row.empty:
+        # 그룹진도표에서 해당 날짜 행 찾기 (다양한 형식 지원, 첫 번째 행만 사용)
+        date_pos = find_date_row_index(그룹진도표, date_str)
+        if date_pos is None:
             return None
+        date_row = 그룹진도표.iloc[[date_pos]]
         
         # 반정보에서 해당 반의 컬럼명 찾기
         class_info = 반정보[반정보['반코드'] == class_name]
@@ -244,6 +245,47 @@ def get_class_progress(date_str, class_name, 그룹진도표, 반정보):
     except Exception as e:
         return None
 
+# ========================
+# 변경 피드 (이전 동기화와 비교)
+# ========================
+# 반정보 컬럼 → 진도 항목 이름 (get_class_progress 결과 키와 동일)
+PROGRESS_COLUMNS = {
+    '진도-문법': '문법',
+    '과제-문법': '문법과제',
+    '진도-듣기': '듣기',
+    '진도-독해': '독해',
+    '과제-독해': '독해과제'
+}
+
+def get_date_changed_columns(snapshot, date_str, 그룹진도표):
+    """선택한 날짜에 표시되는 그룹진도표 행(get_class_progress와 같은 첫 번째 행)의 바뀐 컬럼"""
+    date_pos = find_date_row_index(그룹진도표, date_str)
+    if date_pos is None:
+        return set()
+    row_key = build_row_keys(그룹진도표, get_key_columns(그룹진도표, "그룹진도표"))[date_pos]
+    return get_changed_columns(snapshot, "그룹진도표", row_key)
+
+def get_changed_subjects(class_name, 반정보, changed_cols):
+    """특정 반의 진도 항목 중 마지막 동기화에서 바뀐 항목"""
+    if not changed_cols:
+        return set()
+    
+    class_info = 반정보[반정보['반코드'] == class_name]
+    if class_info.empty:
+        return set()
+    
+    subjects = set()
+    for info_col, subject in PROGRESS_COLUMNS.items():
+        if info_col in class_info.columns and class_info[info_col].iloc[0] in changed_cols:
+            subjects.add(subject)
+    return subjects
+
+def mark_if_changed(text, subject, changed_subjects):
+    """바뀐 진도 항목은 강조 표시"""
+    if subject in changed_subjects:
+        return f'<span class="progress-changed">🆕 {text}</span>'
+    return text
+
 # ========================
 # 메인 UI
 # ========================
@@ -321,7 +363,7 @@ def main():
         st.stop()
     
     with st.spinner("📊 Google Sheets에서 데이터 로딩 중..."):
-        학생명단, 반정보, 그룹진도표, 개별진도표 = load_sheet_data(client, sheet_id)
+        학생명단, 반정보, 그룹진도표, 개별진도표, snapshot = load_sheet_data(client, sheet_id)
     
     if 그룹진도표 is None:
         st.error("❌ 데이터를 불러올 수 없습니다")
@@ -343,6 +385,20 @@ def main():
     - 개별진도: {len(개별진도표)}건
     """)
     
+    # 변경 피드 (동기화는 load_sheet_data에서 다시 불러올 때만 실행)
+    with st.sidebar.expander(f"🔔 최근 변경 내역 ({len(snapshot['recent_changes'])}건)"):
+        if snapshot['synced_at']:
+            st.caption(f"마지막 변경 감지: {snapshot['synced_at']}")
+        if not snapshot['recent_changes']:
+            st.write("변경 내역이 없습니다")
+        for change in snapshot['recent_changes']:
+            old_val = change['old'] if len(change['old']) <= 40 else change['old'][:40] + "..."
+            new_val = change['new'] if len(change['new']) <= 40 else change['new'][:40] + "..."
+            if change['column']:
+                st.write(f"- `{change['synced_at']}` **{change['sheet']} · {change['row']}** {change['column']}: {old_val or '(빈칸)'} → {new_val or '(빈칸)'}")
+            else:
+                st.write(f"- `{change['synced_at']}` **{change['sheet']} · {change['row']}** {new_val}")
+    
     # 디버깅: 그룹진도표 날짜 확인
     with st.sidebar.expander("🔍 디버깅 정보"):
         st.write("**그룹진도표 날짜 목록 (최근 10개):**")
@@ -375,6 +431,9 @@ def main():
         room_keys = ["대강의실(원장)", "유리방(민서T)", "나무방(승연T)", "모고방(관리T)"]
         room_names = ["대강의실(원장)", "유리방(민서T)", "나무방(승연T)", "모고방(관리T)"]
     
+    # 마지막 동기화에서 바뀐 그룹진도표 컬럼 (선택한 날짜 행)
+    그룹진도_변경컬럼 = get_date_changed_columns(snapshot, selected_date.strftime("%Y-%m-%d"), 그룹진도표)
+    
     # HTML 생성 (리스트로 모아서 join)
     html_parts = []
     
@@ -437,6 +496,13 @@ def main():
             color: #ccc;
             font-size: 16px;
         }
+        .changed-cell {
+            box-shadow: inset 0 0 0 2px #f0ad4e;
+        }
+        .progress-changed {
+            background-color: #fff3cd;
+            font-weight: bold;
+        }
     </style>
     <table class="schedule-table">
         <thead>
@@ -469,6 +535,7 @@ def main():
                 # 진도 정보
                 activity_lower = info['내용'].lower()
                 progress_items = []
+                cell_changed = False
                 
                 for class_name in class_names:
                     if class_name in ['초등', '중등', '수능', '정시']:
@@ -485,6 +552,8 @@ def main():
                         그룹진도표,
                         반정보
                     )
+                    changed_subjects = get_changed_subjects(full_class_name, 반정보, 그룹진도_변경컬럼)
+                    shown_subjects = set()
                     
                     if progress:
                         # 시험, 오답, 재시험, 해석 → 진도 표시 안 함
@@ -499,45 +568,52 @@ def main():
                                 content = str(progress['문법과제'])
                                 if len(content) > 40:
                                     content = content[:40] + "..."
-                                progress_items.append(f"과제: {content}")
+                                progress_items.append(mark_if_changed(f"과제: {content}", '문법과제', changed_subjects))
+                                shown_subjects.add('문법과제')
                             elif '독해' in activity_lower and '독해과제' in progress:
                                 content = str(progress['독해과제'])
                                 if len(content) > 40:
                                     content = content[:40] + "..."
-                                progress_items.append(f"과제: {content}")
+                                progress_items.append(mark_if_changed(f"과제: {content}", '독해과제', changed_subjects))
+                                shown_subjects.add('독해과제')
                             # 과제만 있고 과목 없으면 모든 과제 표시
                             elif not any(x in activity_lower for x in ['문법', '독해']):
                                 if '문법과제' in progress:
                                     content = str(progress['문법과제'])
                                     if len(content) > 40:
                                         content = content[:40] + "..."
-                                    progress_items.append(f"문법과제: {content}")
+                                    progress_items.append(mark_if_changed(f"문법과제: {content}", '문법과제', changed_subjects))
+                                    shown_subjects.add('문법과제')
                                 if '독해과제' in progress:
                                     content = str(progress['독해과제'])
                                     if len(content) > 40:
                                         content = content[:40] + "..."
-                                    progress_items.append(f"독해과제: {content}")
+                                    progress_items.append(mark_if_changed(f"독해과제: {content}", '독해과제', changed_subjects))
+                                    shown_subjects.add('독해과제')
                         
                         # 문법 수업
                         elif '문법' in activity_lower and '문법' in progress:
                             content = str(progress['문법'])
                             if len(content) > 40:
                                 content = content[:40] + "..."
-                            progress_items.append(f"문법: {content}")
+                            progress_items.append(mark_if_changed(f"문법: {content}", '문법', changed_subjects))
+                            shown_subjects.add('문법')
                         
                         # 독해 수업 (모고 포함)
                         elif ('독해' in activity_lower or '모고' in activity_lower or '문제풀이' in activity_lower) and '독해' in progress:
                             content = str(progress['독해'])
                             if len(content) > 40:
                                 content = content[:40] + "..."
-                            progress_items.append(f"독해: {content}")
+                            progress_items.append(mark_if_changed(f"독해: {content}", '독해', changed_subjects))
+                            shown_subjects.add('독해')
                         
                         # 듣기 수업
                         elif '듣기' in activity_lower and '듣기' in progress:
                             content = str(progress['듣기'])
                             if len(content) > 40:
                                 content = content[:40] + "..."
-                            progress_items.append(f"듣기: {content}")
+                            progress_items.append(mark_if_changed(f"듣기: {content}", '듣기', changed_subjects))
+                            shown_subjects.add('듣기')
                         
                         # "수업"만 있고 특정 과목이 없으면 → 모든 진도 표시
                         elif '수업' in activity_lower and not any(x in activity_lower for x in ['문법', '독해', '듣기', '과제']):
@@ -546,7 +622,12 @@ def main():
                                     content_str = str(content)
                                     if len(content_str) > 40:
                                         content_str = content_str[:40] + "..."
-                                    progress_items.append(f"{subject}: {content_str}")
+                                    progress_items.append(mark_if_changed(f"{subject}: {content_str}", subject, changed_subjects))
+                                    shown_subjects.add(subject)
+                    
+                    # 마지막 동기화에서 바뀐 진도를 표시했으면 셀 강조
+                    if changed_subjects & shown_subjects:
+                        cell_changed = True
                 
                 if progress_items:
                     cell_parts.append('<div class="progress">')
@@ -554,7 +635,10 @@ def main():
                         cell_parts.append(f'{item}<br>')
                     cell_parts.append('</div>')
                 
-                html_parts.append(f'<td>{"".join(cell_parts)}</td>')
+                if cell_changed:
+                    html_parts.append(f'<td class="changed-cell">{"".join(cell_parts)}</td>')
+                else:
+                    html_parts.append(f'<td>{"".join(cell_parts)}</td>')
             else:
                 html_parts.append('<td class="empty-cell">-</td>')
         
@@ -0,0 +1,239 @@
+"""진도 변경 피드 (이전 동기화 스냅샷과 비교)
+
+Streamlit 없이 pandas만 사용하므로 작은 DataFrame으로 바로 테스트할 수 있음
+"""
+import hashlib
+import json
+import os
+import tempfile
+from collections import defaultdict
+from datetime import datetime
+
+import pandas as pd
+
+SNAPSHOT_DIR = "."
+
+# 비교할 시트: 행 키 후보 컬럼 (있는 컬럼만 조합, 하나도 없으면 시트 행 번호 사용)
+CHANGE_FEED_SHEETS = {
+    "그룹진도표": ["날짜"],
+    "개별진도표": ["학생명", "이름", "학생", "날짜"]
+}
+
+RECENT_CHANGES_LIMIT = 30
+
+
+def cell_text(val):
+    """셀 값을 비교용 문자열로 변환 (빈 값/nan → 빈 문자열)"""
+    text = str(val).strip()
+    return "" if text == 'nan' else text
+
+
+def find_date_row_index(그룹진도표, date_str):
+    """그룹진도표에서 해당 날짜의 첫 번째 행 위치 (없거나 날짜 컬럼이 없으면 None)"""
+    if '날짜' not in 그룹진도표.columns:
+        return None
+    # 날짜 형식 통일 (25-11-10 형식)
+    formatted_date = datetime.strptime(date_str, "%Y-%m-%d").strftime("%y-%m-%d")
+    for pos, val in enumerate(그룹진도표['날짜']):
+        date_col = str(val).strip()
+        # "25-11-10 월" 형식도 지원
+        if formatted_date in date_col or date_col.startswith(formatted_date):
+            return pos
+    return None
+
+
+def get_key_columns(df, sheet_name):
+    """시트에 실제로 있는 행 키 컬럼 목록"""
+    return [col for col in CHANGE_FEED_SHEETS[sheet_name] if col in df.columns]
+
+
+def build_row_keys(df, key_cols):
+    """행마다 고유 키 생성 (키 컬럼 값 조합, 비어 있으면 행 번호 / 중복이면 순번 추가)"""
+    keys = []
+    used = set()
+    for idx in range(len(df)):
+        parts = [cell_text(df[col].iloc[idx]) for col in key_cols]
+        base_key = " · ".join(part for part in parts if part)
+        if not base_key:
+            base_key = f"{idx + 2}행"  # 1행은 헤더
+        key = base_key
+        count = 1
+        # 순번을 붙인 키가 다른 행의 실제 값과 겹칠 수 있으므로 빈 키가 나올 때까지 증가
+        while key in used:
+            count += 1
+            key = f"{base_key} ({count})"
+        used.add(key)
+        keys.append(key)
+    return keys
+
+
+def compute_row_hashes(df, keys):
+    """행별 내용 해시 계산 (pandas 벡터 해시, 재시작해도 값이 같음)"""
+    if df.empty:
+        return {}
+    hashes = pd.util.hash_pandas_object(df.astype(str), index=False)
+    return {key: str(h) for key, h in zip(keys, hashes)}
+
+
+def snapshot_path(sheet_id):
+    """스프레드시트마다 별도 스냅샷 파일 경로"""
+    digest = hashlib.sha1(sheet_id.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(SNAPSHOT_DIR, f"progress_snapshot_{digest}.json")
+
+
+def empty_snapshot():
+    """비교 기준이 없는 빈 스냅샷"""
+    return {"synced_at": None, "sheets": {}, "last_changes": [], "recent_changes": []}
+
+
+def is_valid_snapshot(snapshot):
+    """불러온 스냅샷 구조 확인 (JSON은 맞지만 형식이 다른 파일 걸러냄)"""
+    if not isinstance(snapshot, dict):
+        return False
+    if not isinstance(snapshot.get("sheets"), dict):
+        return False
+    if not isinstance(snapshot.get("last_changes"), list) or not isinstance(snapshot.get("recent_changes"), list):
+        return False
+    for sheet in snapshot["sheets"].values():
+        if not isinstance(sheet, dict):
+            return False
+        if not isinstance(sheet.get("columns"), list):
+            return False
+        if not isinstance(sheet.get("hashes"), dict) or not isinstance(sheet.get("rows"), dict):
+            return False
+    changes = snapshot["last_changes"] + snapshot["recent_changes"]
+    return all(isinstance(change, dict) and {"sheet", "row", "column"} <= change.keys() for change in changes)
+
+
+def load_snapshot(path):
+    """저장된 스냅샷 불러오기 (없거나 손상되거나 형식이 다르면 None)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return snapshot if is_valid_snapshot(snapshot) else None
+
+
+def save_snapshot(path, snapshot):
+    """스냅샷 전체를 임시 파일에 쓴 뒤 교체 (동시 세션끼리 임시 파일이 겹치지 않음)"""
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(path) or ".",
+                                         prefix="progress_snapshot_", suffix=".json.tmp", delete=False) as f:
+            tmp_path = f.name
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def diff_sheet(sheet_name, df, old_sheet):
+    """이전 시트 스냅샷과 비교 → (새 시트 스냅샷 또는 변경 없으면 None, 변경 목록)
+
+    내용 해시가 그대로인 행은 위치·키가 바뀌어도 이동으로 보고 건너뜀.
+    나머지 행만 같은 키의 이전 행과 컬럼 단위로 비교함.
+    """
+    columns = [str(col) for col in df.columns]
+    key_cols = get_key_columns(df, sheet_name)
+    keys = build_row_keys(df, key_cols)
+    new_hashes = compute_row_hashes(df, keys)
+
+    old_hashes = old_sheet.get("hashes", {})
+    old_rows = old_sheet.get("rows", {})
+
+    # 처음 보는 시트거나 열 구성이 바뀌면 기준점을 새로 만듦
+    if not old_sheet or old_sheet.get("columns") != columns:
+        rows = {new_hashes[key]: {col: cell_text(val) for col, val in zip(columns, df.iloc[pos])}
+                for pos, key in enumerate(keys)}
+        changes = []
+        if old_sheet:
+            changes.append({"sheet": sheet_name, "row": "-", "column": None, "old": "",
+                            "new": "(열 구성 변경 · 비교 기준 초기화)"})
+        return {"columns": columns, "hashes": new_hashes, "rows": rows}, changes
+
+    if new_hashes == old_hashes:
+        return None, []
+
+    # 내용이 같은 행끼리 먼저 짝지음 (같은 키 우선)
+    old_keys_by_hash = defaultdict(list)
+    for key, h in old_hashes.items():
+        old_keys_by_hash[h].append(key)
+    unmatched_old = set(old_hashes)
+    unmatched_new = []
+    for key, h in new_hashes.items():
+        candidates = [k for k in old_keys_by_hash[h] if k in unmatched_old]
+        if not candidates:
+            unmatched_new.append(key)
+            continue
+        unmatched_old.discard(key if key in candidates else candidates[0])
+
+    positions = {key: pos for pos, key in enumerate(keys)}
+    rows = {h: old_rows[h] for h in set(new_hashes.values()) if h in old_rows}
+    changes = []
+
+    for key in unmatched_new:
+        new_row = {col: cell_text(val) for col, val in zip(columns, df.iloc[positions[key]])}
+        rows[new_hashes[key]] = new_row
+        if key in unmatched_old:
+            old_row = old_rows.get(old_hashes[key], {})
+            unmatched_old.discard(key)
+        else:
+            old_row = {}
+        for col, val in new_row.items():
+            if col in key_cols:
+                continue
+            old_val = old_row.get(col, "")
+            if old_val != val:
+                changes.append({"sheet": sheet_name, "row": key, "column": col, "old": old_val, "new": val})
+
+    for key in old_hashes:
+        if key in unmatched_old:
+            changes.append({"sheet": sheet_name, "row": key, "column": None, "old": "", "new": "(행 삭제)"})
+
+    return {"columns": columns, "hashes": new_hashes, "rows": rows}, changes
+
+
+def sync_change_feed(sheet_id, progress_sheets):
+    """진도 시트를 이전 스냅샷과 비교하고 변경 내역을 스냅샷에 기록
+
+    데이터를 새로 불러왔을 때 한 번만 호출해야 함 (last_changes는 이번 동기화 결과로 교체)
+    """
+    path = snapshot_path(sheet_id)
+    snapshot = load_snapshot(path)
+    if snapshot is None:
+        snapshot = empty_snapshot()
+
+    now = datetime.now().strftime("%Y-%m-%d %H:%M")
+    new_changes = []
+    updated = bool(snapshot["last_changes"])
+
+    for sheet_name, df in progress_sheets.items():
+        new_sheet, changes = diff_sheet(sheet_name, df, snapshot["sheets"].get(sheet_name, {}))
+        if new_sheet is None:
+            continue
+        snapshot["sheets"][sheet_name] = new_sheet
+        new_changes.extend(changes)
+        updated = True
+
+    for change in new_changes:
+        change["synced_at"] = now
+    snapshot["last_changes"] = new_changes
+    if new_changes:
+        snapshot["recent_changes"] = (new_changes + snapshot["recent_changes"])[:RECENT_CHANGES_LIMIT]
+        snapshot["synced_at"] = now
+
+    if updated:
+        save_snapshot(path, snapshot)
+
+    return snapshot
+
+
+def get_changed_columns(snapshot, sheet_name, row_key):
+    """마지막 동기화에서 해당 행의 바뀐 컬럼 집합"""
+    return {
+        change["column"]
+        for change in snapshot.get("last_changes", [])
+        if change["sheet"] == sheet_name and change["row"] == row_key and change["column"]
+    }
@@ -0,0 +1,138 @@
+import pandas as pd
+import pytest
+
+import change_feed
+from change_feed import build_row_keys, diff_sheet, find_date_row_index, get_changed_columns, sync_change_feed
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(change_feed, "SNAPSHOT_DIR", str(tmp_path))
+    return tmp_path
+
+
+def group_sheet(rows):
+    return pd.DataFrame(rows, columns=["날짜", "A문법", "A독해"])
+
+
+def test_build_row_keys_dedupes_and_falls_back_to_row_number():
+    df = pd.DataFrame({"날짜": ["25-11-10 월", "25-11-10 월", ""]})
+    assert build_row_keys(df, ["날짜"]) == ["25-11-10 월", "25-11-10 월 (2)", "4행"]
+    assert build_row_keys(df, []) == ["2행", "3행", "4행"]
+
+    colliding = pd.DataFrame({"날짜": ["X", "X", "X (2)"]})
+    keys = build_row_keys(colliding, ["날짜"])
+    assert keys == ["X", "X (2)", "X (2) (2)"]
+    assert len(set(keys)) == 3
+
+
+def test_colliding_keys_keep_every_row_in_snapshot():
+    df = pd.DataFrame({"날짜": ["X", "X", "X (2)"], "a": ["1", "2", "3"]})
+    sheet, _ = diff_sheet("그룹진도표", df, {})
+    assert len(sheet["hashes"]) == 3
+    assert sorted(row["a"] for row in sheet["rows"].values()) == ["1", "2", "3"]
+    for key, row in zip(build_row_keys(df, ["날짜"]), df["a"]):
+        assert sheet["rows"][sheet["hashes"][key]]["a"] == row
+
+
+def test_find_date_row_index_without_date_column():
+    assert find_date_row_index(pd.DataFrame([]), "2025-11-10") is None
+    assert find_date_row_index(pd.DataFrame({"A문법": ["1과"]}), "2025-11-10") is None
+
+
+def test_empty_sheet_syncs_without_error():
+    snapshot = sync_change_feed("sheet", {"그룹진도표": pd.DataFrame([]), "개별진도표": pd.DataFrame([])})
+    assert snapshot["last_changes"] == []
+
+
+def test_malformed_snapshot_file_falls_back_to_fresh_baseline():
+    path = change_feed.snapshot_path("sheet")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{}")
+
+    df = group_sheet([["25-11-10 월", "1과", 3]])
+    assert sync_change_feed("sheet", {"그룹진도표": df})["last_changes"] == []
+    assert change_feed.load_snapshot(path) is not None
+
+
+def test_first_sync_is_baseline_and_edit_is_reported():
+    df = group_sheet([["25-11-10 월", "1과", 3], ["25-11-11 화", "", 4]])
+    assert sync_change_feed("sheet", {"그룹진도표": df})["last_changes"] == []
+
+    edited = df.copy()
+    edited.loc[1, "A문법"] = "2과"
+    snapshot = sync_change_feed("sheet", {"그룹진도표": edited})
+    changes = [(c["row"], c["column"], c["old"], c["new"]) for c in snapshot["last_changes"]]
+    assert changes == [("25-11-11 화", "A문법", "", "2과")]
+    assert len(snapshot["recent_changes"]) == 1
+
+
+def test_reload_without_changes_clears_last_changes():
+    df = group_sheet([["25-11-10 월", "1과", 3]])
+    sync_change_feed("sheet", {"그룹진도표": df})
+    edited = df.copy()
+    edited.loc[0, "A문법"] = "2과"
+    assert sync_change_feed("sheet", {"그룹진도표": edited})["last_changes"]
+
+    snapshot = sync_change_feed("sheet", {"그룹진도표": edited})
+    assert snapshot["last_changes"] == []
+    assert len(snapshot["recent_changes"]) == 1
+
+
+def test_inserted_row_without_key_columns_is_not_reported_as_shifted_edits():
+    df = pd.DataFrame({"메모": ["a", "b", "c"], "내용": ["x", "y", "z"]})
+    sync_change_feed("sheet", {"개별진도표": df})
+
+    inserted = pd.concat([pd.DataFrame({"메모": ["new"], "내용": ["w"]}), df], ignore_index=True)
+    changes = sync_change_feed("sheet", {"개별진도표": inserted})["last_changes"]
+    assert [(c["row"], c["column"], c["new"]) for c in changes] == [("2행", "메모", "new"), ("2행", "내용", "w")]
+
+
+def test_individual_sheet_is_keyed_on_student_and_date():
+    df = pd.DataFrame({"이름": ["민수", "지영"], "날짜": ["25-11-10", "25-11-10"], "진도": ["1과", "2과"]})
+    sync_change_feed("sheet", {"개별진도표": df})
+
+    edited = df.iloc[::-1].reset_index(drop=True)
+    edited.loc[0, "진도"] = "3과"
+    changes = sync_change_feed("sheet", {"개별진도표": edited})["last_changes"]
+    assert [(c["row"], c["old"], c["new"]) for c in changes] == [("지영 · 25-11-10", "2과", "3과")]
+
+
+def test_renamed_column_resets_baseline():
+    df = pd.DataFrame({"날짜": ["25-11-10 월"], "A": ["x"]})
+    sync_change_feed("sheet", {"그룹진도표": df})
+
+    renamed = df.rename(columns={"A": "B"})
+    changes = sync_change_feed("sheet", {"그룹진도표": renamed})["last_changes"]
+    assert [c["column"] for c in changes] == [None]
+
+    edited = renamed.copy()
+    edited.loc[0, "B"] = "y"
+    changes = sync_change_feed("sheet", {"그룹진도표": edited})["last_changes"]
+    assert [(c["column"], c["old"], c["new"]) for c in changes] == [("B", "x", "y")]
+
+
+def test_snapshots_are_kept_per_spreadsheet():
+    first = group_sheet([["25-11-10 월", "1과", 3]])
+    second = group_sheet([["25-11-11 화", "9과", 9]])
+    sync_change_feed("sheet-a", {"그룹진도표": first})
+    assert sync_change_feed("sheet-b", {"그룹진도표": second})["last_changes"] == []
+    assert sync_change_feed("sheet-a", {"그룹진도표": first})["recent_changes"] == []
+
+
+def test_changes_on_duplicate_date_row_are_not_attributed_to_first_row():
+    df = group_sheet([["25-11-10 월", "1과", 3], ["25-11-10 월", "x", 0]])
+    sync_change_feed("sheet", {"그룹진도표": df})
+    edited = df.copy()
+    edited.loc[1, "A문법"] = "y"
+    snapshot = sync_change_feed("sheet", {"그룹진도표": edited})
+
+    date_pos = find_date_row_index(edited, "2025-11-10")
+    row_key = build_row_keys(edited, ["날짜"])[date_pos]
+    assert get_changed_columns(snapshot, "그룹진도표", row_key) == set()
+
+
+def test_diff_sheet_returns_none_when_unchanged():
+    df = group_sheet([["25-11-10 월", "1과", 3]])
+    sheet, _ = diff_sheet("그룹진도표", df, {})
+    assert diff_sheet("그룹진도표", df, sheet) == (None, [])